@@ -3,9 +3,22 @@ import asyncio
 import os
 import argparse
 from playwright.async_api import async_playwright
+import httpx
+import pandas as pd
 import re
+import shelve
 import time
+from collections import defaultdict
 from datetime import datetime
+from urllib.parse import urlparse
+
+CACHE_FILE = "career_cache.db"
+CACHE_TTL = 7 * 24 * 60 * 60  # Re-probe a domain after a week
+
+MAX_REQUESTS_PER_HOST = 2  # Concurrent page loads allowed against a single host
+MAX_PROBES_PER_HOST = 4  # Concurrent plain-HTTP probes allowed against a single host
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 # ======== SIGNIFICANTLY EXPANDED URL PATTERNS ========
 URL_PATTERNS = [
@@ -95,14 +108,169 @@ LINK_TEXTS = [
     r"life\s+at", r"work\s+life"
 ]
 
-async def check_subdomain_urls(base_url, company_name):
-    """Try common career subdomains"""
-    parsed_url = re.match(r'https?://(?:www\.)?([^/]+)', base_url)
+# ======== BLOCKED RESOURCES ========
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "facebook.net", "hotjar.com", "segment.io", "segment.com",
+    "mixpanel.com", "hubspot.com", "intercom.io", "clarity.ms"
+]
+
+# ======== PRE-COMPILED PATTERNS ========
+LINK_TEXT_PATTERNS = [re.compile(p, re.I) for p in LINK_TEXTS]
+THIRD_PARTY_COMPILED = [re.compile(p, re.I) for p in THIRD_PARTY_PATTERNS]
+LINK_TEXT_UNION = re.compile("(" + "|".join(LINK_TEXTS) + ")", re.I)
+NAV_TEXT_PATTERNS = {
+    nav_text: re.compile(f"^{nav_text}$", re.I)
+    for nav_text in ["company", "about", "about us", "team", "life", "work"]
+}
+DOMAIN_RE = re.compile(r'https?://(?:www\.)?([^/]+)')
+CAREER_CONTENT_RE = re.compile(r"(career|job|position|opening|opportunit|vacanc)", re.I)
+CAREER_KEYWORDS = ("career", "job", "position", "opening", "opportunit", "vacanc")
+CAREER_PAGE_KEYWORDS = CAREER_KEYWORDS + ("work with us", "employ")
+CONTENT_PREFIX_BYTES = 65536  # Only sniff the start of each page
+# Signals that a page is a client-side rendered shell
+EMPTY_MOUNT_RE = re.compile(r'<div[^>]*\bid=["\']?(root|app|__next|__nuxt)["\']?[^>]*>\s*</div>', re.I)
+BODY_RE = re.compile(r'<body[^>]*>(.*?)</body>', re.I | re.S)
+SCRIPT_BLOCK_RE = re.compile(r'<(script|style|noscript|template)\b.*?</\1\s*>', re.I | re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+MIN_VISIBLE_WORDS = 20
+SEARCH_RESULT_RE = re.compile(r"(career|job|position|opening|join|work)", re.I)
+
+BLOCKED_HOSTS_RE = re.compile(r"^https?://([^/]+\.)?(" + "|".join(map(re.escape, BLOCKED_HOSTS)) + r")(/|:|$)", re.I)
+
+async def block_heavy_resources(route):
+    """Abort requests that don't affect the page text we scrape"""
+    request = route.request
+    # Never abort page navigations: some companies (e.g. Segment, HubSpot) live on blocked hosts
+    if not request.is_navigation_request() and (
+        request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_HOSTS_RE.match(request.url)
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Per-host limits so unrelated companies never wait on each other
+host_limits = defaultdict(lambda: asyncio.Semaphore(MAX_REQUESTS_PER_HOST))
+probe_limits = defaultdict(lambda: asyncio.Semaphore(MAX_PROBES_PER_HOST))
+
+async def goto(page, url, **kwargs):
+    """Navigate the page while holding the target host's slot"""
+    async with host_limits[urlparse(url).netloc]:
+        return await page.goto(url, **kwargs)
+
+def create_http_client():
+    """Create the HTTP/2 client shared by every reachability probe"""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100),
+        # Waiting for a pooled connection is not a sign the site is down
+        timeout=httpx.Timeout(5, pool=None),
+        headers={"User-Agent": USER_AGENT}
+    )
+
+async def fetch_url(client, url, timeout=5, errors=None):
+    """GET a URL and return (url, status, text prefix), or None if unreachable"""
+    # Throttle per host so a fan-out of probes doesn't hammer one site
+    async with probe_limits[urlparse(url).netloc]:
+        try:
+            request_timeout = httpx.Timeout(timeout, pool=None)
+            async with client.stream("GET", url, follow_redirects=True, timeout=request_timeout) as response:
+                if response.status_code >= 400:
+                    # Only "not found"/"gone" prove the page doesn't exist; 429, 5xx and
+                    # other refusals may succeed next time, so report them
+                    if response.status_code not in (404, 410) and errors is not None:
+                        errors.append(f"fetch {url}: HTTP {response.status_code}")
+                    return None
+                # Career keywords show up early in the HTML, so stop reading after the prefix
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= CONTENT_PREFIX_BYTES:
+                        break
+                text = bytes(body[:CONTENT_PREFIX_BYTES]).decode(response.encoding or "utf-8", "ignore")
+                return (url, response.status_code, text)
+        except httpx.ConnectError:
+            # DNS failure or refused connection: the host simply isn't there
+            return None
+        except Exception as e:
+            # Timeouts and broken connections say nothing about the page; report them
+            if errors is not None:
+                errors.append(f"fetch {url}: {type(e).__name__}")
+            return None
+
+def looks_like_career_page(content, keywords):
+    """Substring check for career keywords on the page prefix"""
+    head = content[:CONTENT_PREFIX_BYTES].lower()
+    return any(keyword in head for keyword in keywords)
+
+def looks_js_rendered(html):
+    """Heuristic: page is an empty shell whose content is rendered by scripts"""
+    if EMPTY_MOUNT_RE.search(html):
+        return True
+    # A page that filled the whole prefix has plenty of server-rendered markup
+    if len(html) >= CONTENT_PREFIX_BYTES:
+        return False
+    body = BODY_RE.search(html)
+    visible = TAG_RE.sub(" ", SCRIPT_BLOCK_RE.sub(" ", body.group(1) if body else html))
+    return len(visible.split()) < MIN_VISIBLE_WORDS
+
+def normalize_site_url(base_url):
+    """Cache key for a company site: lowercased host without www. plus path"""
+    parsed_url = urlparse(base_url)
+    host = parsed_url.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host + parsed_url.path.rstrip("/")
+
+def get_base_domain(base_url):
+    """Get e.g. "company.com" from "https://www.company.com/..." """
+    parsed_url = DOMAIN_RE.match(base_url)
     if not parsed_url:
         return None
     
     domain = parsed_url.group(1)
-    base_domain = '.'.join(domain.split('.')[-2:]) # Gets e.g. "company.com" from "www.company.com"
+    return '.'.join(domain.split('.')[-2:])
+
+# On-disk cache of resolved career URLs, shared by all workers
+_cache = None
+
+def open_cache(filename=CACHE_FILE):
+    """Open the persistent career URL cache"""
+    global _cache
+    _cache = shelve.open(filename)
+    return _cache
+
+def close_cache():
+    """Flush and close the persistent career URL cache if it was opened"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+def cache_get(key):
+    """Return (hit, value) for a cache key, ignoring expired entries"""
+    # shelve calls are synchronous, so workers on the event loop can't interleave them
+    if _cache is None:
+        return False, None
+    entry = _cache.get(key)
+    if entry is None:
+        return False, None
+    timestamp, value = entry
+    if time.time() - timestamp > CACHE_TTL:
+        return False, None
+    return True, value
+
+def cache_set(key, value):
+    """Store a value in the cache with the current timestamp"""
+    if _cache is not None:
+        _cache[key] = (time.time(), value)
+
+async def check_subdomain_urls(client, base_url, company_name, page=None, errors=None):
+    """Try common career subdomains"""
+    base_domain = get_base_domain(base_url)
+    if not base_domain:
+        return None
     
     subdomain_urls = []
     for pattern in SUBDOMAIN_PATTERNS:
@@ -110,134 +278,209 @@ async def check_subdomain_urls(base_url, company_name):
     
     print(f"  → Checking {len(subdomain_urls)} possible career subdomains...")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        for url in subdomain_urls:
+    # Probe every subdomain in parallel over plain HTTP
+    responses = await asyncio.gather(*[fetch_url(client, url, errors=errors) for url in subdomain_urls])
+    
+    suspects = []
+    for response in responses:
+        if response is None:
+            continue
+        url, status, content = response
+        if looks_like_career_page(content, CAREER_KEYWORDS):
+            print(f"  ✅ Found career subdomain: {url}")
+            return url
+        if looks_js_rendered(content):
+            suspects.append(url)
+    
+    # Only render with Playwright when the raw HTML is likely client-side rendered
+    if page is not None:
+        for url in suspects:
             try:
-                print(f"  → Trying subdomain: {url}")
-                response = await page.goto(url, timeout=8000)
+                print(f"  → Rendering JS subdomain: {url}")
+                response = await goto(page, url, timeout=8000)
                 
                 if response and response.status < 400:
                     content = await page.content()
-                    if re.search(r"(career|job|position|opening|opportunit|vacanc)", content, re.I):
+                    if looks_like_career_page(content, CAREER_KEYWORDS):
                         print(f"  ✅ Found career subdomain: {url}")
-                        await browser.close()
                         return url
             except Exception as e:
+                if errors is not None:
+                    errors.append(f"render {url}: {e}")
                 continue
-                
-        await browser.close()
+    
+    return None
+
+# Collects (href, visible text, inside footer, inside nav/header) for every link
+EXTRACT_LINKS_JS = """() => Array.from(document.querySelectorAll('a')).map(a => [
+    a.getAttribute('href') || '',
+    (a.innerText || '').trim(),
+    !!a.closest('footer'),
+    !!a.closest('nav,header')
+])"""
+
+async def extract_links(page):
+    """Return all links on the page in a single evaluate call"""
+    return await page.evaluate(EXTRACT_LINKS_JS)
+
+def resolve_href(base_url, href):
+    """Turn a relative link into an absolute URL on the company site"""
+    if href.startswith("/"):
+        return base_url.rstrip("/") + href
+    elif not href.startswith(("http://", "https://")):
+        return base_url.rstrip("/") + "/" + href
+    return href
+
+def link_text_priority(text):
+    """Index of the earliest LINK_TEXTS pattern the text matches, or None"""
+    # The union rejects most links in one scan before trying patterns in order
+    if not LINK_TEXT_UNION.search(text):
+        return None
+    for index, pattern in enumerate(LINK_TEXT_PATTERNS):
+        if pattern.search(text):
+            return index
     return None
 
-async def find_career_page(page, base_url, company_name):
+def match_career_link(links, base_url, scope=None):
+    """Return the best career-looking link, optionally restricted by scope(in_footer, in_nav)"""
+    best_href = None
+    best_priority = None
+    for href, text, in_footer, in_nav in links:
+        if not href or not text:
+            continue
+        if scope is not None and not scope(in_footer, in_nav):
+            continue
+        # Earlier LINK_TEXTS win, e.g. "career" beats "position"; DOM order breaks ties
+        priority = link_text_priority(text)
+        if priority is not None and (best_priority is None or priority < best_priority):
+            best_href = href
+            best_priority = priority
+            if priority == 0:
+                break
+    if best_href is None:
+        return None
+    return resolve_href(base_url, best_href)
+
+async def find_career_page(page, client, base_url, company_name):
+    """Find the careers page, reusing a cached result for the site when fresh"""
+    cache_key = f"url:{normalize_site_url(base_url)}"
+    hit, career_url = cache_get(cache_key)
+    if hit:
+        print(f"\n🗃️ Using cached result for {company_name} ({base_url}): {career_url or 'no career URL'}")
+        return career_url
+    
+    errors = []
+    career_url = await search_career_page(page, client, base_url, company_name, errors)
+    # Only remember a miss when every strategy ran without errors
+    if career_url or not errors:
+        cache_set(cache_key, career_url)
+    return career_url
+
+async def search_career_page(page, client, base_url, company_name, errors):
     """Find the careers page through multiple strategies"""
     print(f"\n🔎 Analyzing {company_name} ({base_url})")
     
     # STRATEGY 0: Check for common career subdomains
-    subdomain_url = await check_subdomain_urls(base_url, company_name)
+    subdomain_url = await check_subdomain_urls(client, base_url, company_name, page, errors)
     if subdomain_url:
         return subdomain_url
     
     # STRATEGY 1: Go to homepage and look for navigation menus
     try:
         print(f"  → Visiting homepage and checking navigation")
-        await page.goto(base_url, timeout=20000)
-        await page.wait_for_load_state("networkidle", timeout=10000)
+        await goto(page, base_url, timeout=20000, wait_until="domcontentloaded")
+        
+        # Pull every link on the page in one round-trip and match in Python
+        links = await extract_links(page)
         
         # First check for third-party job boards in any links
-        all_links = await page.get_by_role("link").all()
-        for link in all_links:
-            try:
-                href = await link.get_attribute("href")
-                if href:
-                    # Check for known job board URLs
-                    for pattern in THIRD_PARTY_PATTERNS:
-                        if re.search(pattern, href, re.I):
-                            print(f"  ✅ Found third-party job board: {href}")
-                            return href
-            except:
-                continue
+        for href, text, in_footer, in_nav in links:
+            if href and any(pattern.search(href) for pattern in THIRD_PARTY_COMPILED):
+                print(f"  ✅ Found third-party job board: {href}")
+                return href
+        
+        # STRATEGY 2: Look for footer links directly
+        print(f"  → Checking footer links")
+        href = match_career_link(links, base_url, lambda in_footer, in_nav: in_footer)
+        if href:
+            print(f"  ✅ Found career link in footer: {href}")
+            return href
         
         # Check main navigation elements
-        for nav_text in ["company", "about", "about us", "team", "life", "work"]:
+        href = match_career_link(links, base_url, lambda in_footer, in_nav: in_nav)
+        if href:
+            print(f"  ✅ Found career link via navigation menu: {href}")
+            return href
+        
+        # STRATEGY 3: Search for any career link on the page
+        print(f"  → Scanning entire page for career-related links")
+        href = match_career_link(links, base_url)
+        if href:
+            print(f"  ✅ Found career link on page: {href}")
+            return href
+        
+        # Hover navigation sections to reveal dropdown menus
+        for nav_text, nav_pattern in NAV_TEXT_PATTERNS.items():
+            # Skip the locator round-trip when no link carries this label
+            if not any(nav_pattern.search(text) for _, text, _, _ in links):
+                continue
             print(f"  → Looking for '{nav_text}' navigation section")
-            company_nav = page.get_by_role("link").filter(has_text=re.compile(f"^{nav_text}$", re.I))
+            company_nav = page.get_by_role("link").filter(has_text=nav_pattern)
             
             if await company_nav.count() > 0:
                 print(f"  → Found '{nav_text}' navigation, checking for career links")
                 await company_nav.first.hover()
-                await page.wait_for_timeout(1000)  # Wait for potential dropdown
+                # Wait only as long as it takes a career link to appear in the dropdown
+                try:
+                    await page.get_by_role("link").filter(has_text=LINK_TEXT_UNION).first.wait_for(state="visible", timeout=1000)
+                except Exception:
+                    continue
                 
                 # Look for career links in any revealed dropdown
-                for career_text in LINK_TEXTS:
-                    career_link = page.get_by_role("link").filter(has_text=re.compile(career_text, re.I))
-                    if await career_link.count() > 0:
-                        href = await career_link.first.get_attribute("href")
-                        if href:
-                            # Handle relative URLs
-                            if href.startswith("/"):
-                                href = base_url.rstrip("/") + href
-                            elif not href.startswith(("http://", "https://")):
-                                href = base_url.rstrip("/") + "/" + href
-                            print(f"  ✅ Found career link via navigation menu: {href}")
-                            return href
-        
-        # STRATEGY 2: Look for footer links directly
-        print(f"  → Checking footer links")
-        footer = page.locator("footer")
-        if await footer.count() > 0:
-            print(f"  → Footer found, scanning for career links")
-            for career_text in LINK_TEXTS:
-                footer_career = footer.get_by_role("link").filter(has_text=re.compile(career_text, re.I))
-                if await footer_career.count() > 0:
-                    href = await footer_career.first.get_attribute("href")
-                    if href:
-                        # Handle relative URLs
-                        if href.startswith("/"):
-                            href = base_url.rstrip("/") + href
-                        elif not href.startswith(("http://", "https://")):
-                            href = base_url.rstrip("/") + "/" + href
-                        print(f"  ✅ Found career link in footer: {href}")
-                        return href
-        
-        # STRATEGY 3: Search for any career link on the page
-        print(f"  → Scanning entire page for career-related links")
-        for career_text in LINK_TEXTS:
-            career_link = page.get_by_role("link").filter(has_text=re.compile(career_text, re.I))
-            if await career_link.count() > 0:
-                href = await career_link.first.get_attribute("href")
+                href = match_career_link(await extract_links(page), base_url)
                 if href:
-                    # Handle relative URLs
-                    if href.startswith("/"):
-                        href = base_url.rstrip("/") + href
-                    elif not href.startswith(("http://", "https://")):
-                        href = base_url.rstrip("/") + "/" + href
-                    print(f"  ✅ Found career link on page: {href}")
+                    print(f"  ✅ Found career link via navigation menu: {href}")
                     return href
     except Exception as e:
         print(f"  ⚠️ Error checking homepage navigation: {e}")
+        errors.append(f"homepage: {e}")
     
     # STRATEGY 4: Try direct URL patterns
     print(f"  → Trying {len(URL_PATTERNS)} direct URL patterns")
-    for pattern in URL_PATTERNS:
-        try:
-            test_url = base_url.rstrip('/') + pattern
-            print(f"  → Testing URL: {test_url}")
-            response = await page.goto(test_url, timeout=10000)
-            
-            # Check if page exists (no 404)
-            if response and response.status < 400:
-                # Quick check if this looks like a careers page
-                content = await page.content()
-                if re.search(r"(career|job|position|opening|opportunit|work with us|employ|vacanc)", content, re.I):
-                    print(f"  ✅ Found working careers URL: {test_url}")
-                    return test_url
-        except Exception as e:
-            pass
+    test_urls = [base_url.rstrip('/') + pattern for pattern in dict.fromkeys(URL_PATTERNS)]
+    responses = await asyncio.gather(
+        *[fetch_url(client, test_url, timeout=8, errors=errors) for test_url in test_urls]
+    )
+    
+    # Results keep URL_PATTERNS order, so the most canonical path wins
+    for response in responses:
+        if response is None:
+            continue
+        test_url, status, content = response
+        # Quick check if this looks like a careers page
+        if looks_like_career_page(content, CAREER_PAGE_KEYWORDS):
+            print(f"  ✅ Found working careers URL: {test_url}")
+            return test_url
     
     # STRATEGY 5: Google search as last resort
+    career_url = await google_career_page(page, company_name, errors)
+    if career_url:
+        return career_url
+    
+    print(f"  ❌ Could not find career page for {company_name}")
+    return None
+
+async def google_career_page(page, company_name, errors):
+    """Search Google for the company's career page, memoized per company"""
+    # Without a name every company would share one memo entry
+    cache_key = f"google:{company_name}" if company_name else None
+    if cache_key:
+        hit, career_url = cache_get(cache_key)
+        if hit:
+            return career_url
+    
+    career_url = None
+    search_errors = []
     try:
         print(f"  → Trying Google search fallback")
         search_queries = [
@@ -250,52 +493,61 @@ async def find_career_page(page, base_url, company_name):
         
         for query in search_queries:
             try:
-                await page.goto(f"https://www.google.com/search?q={query}", timeout=15000)
-                await page.wait_for_load_state("networkidle", timeout=10000)
+                await goto(page, f"https://www.google.com/search?q={query}", timeout=15000)
+                await page.wait_for_load_state("networkidle", timeout=5000)
                 
                 # Look for results with career/job in the title
-                results = page.locator("h3").filter(has_text=re.compile(r"(career|job|position|opening|join|work)", re.I))
+                results = page.locator("h3").filter(has_text=SEARCH_RESULT_RE)
                 if await results.count() > 0:
                     # Click first result
                     print(f"  → Found potential result in Google search: '{await results.first.text_content()}', clicking")
                     await results.first.click()
-                    await page.wait_for_load_state("networkidle", timeout=10000)
+                    await page.wait_for_load_state("networkidle", timeout=5000)
                     
                     # Check if it looks like a career page
                     current_url = page.url
                     content = await page.content()
-                    if re.search(r"(career|job|position|opening|opportunit|vacanc)", content, re.I):
+                    if CAREER_CONTENT_RE.search(content):
                         print(f"  ✅ Found career page via Google: {current_url}")
-                        return current_url
+                        career_url = current_url
+                        break
             except Exception as e:
                 print(f"  → Search for '{query}' failed: {str(e)[:50]}...")
+                search_errors.append(f"google '{query}': {e}")
     except Exception as e:
         print(f"  ⚠️ Error with Google search fallback: {e}")
+        search_errors.append(f"google: {e}")
     
-    print(f"  ❌ Could not find career page for {company_name}")
-    return None
+    errors.extend(search_errors)
+    if cache_key and (career_url or not search_errors):
+        cache_set(cache_key, career_url)
+    return career_url
 
-def append_to_csv(filename, row_dict, fieldnames):
-    """Append a single row to CSV file, creating it if needed"""
+async def csv_writer(filename, fieldnames, write_queue):
+    """Drain result rows from the queue into one long-lived CSV handle"""
     file_exists = os.path.isfile(filename)
     
-    with open(filename, 'a', newline='', encoding='utf-8') as f:
+    with open(filename, 'a', newline='', encoding='utf-8', buffering=1 << 16) as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         
         # Write header if file doesn't exist
         if not file_exists:
             writer.writeheader()
         
-        writer.writerow(row_dict)
-    
-    print(f"💾 Saved result to {filename}")
+        while True:
+            row_dict = await write_queue.get()
+            if row_dict is None:
+                break
+            writer.writerow(row_dict)
+            f.flush()
+            print(f"💾 Saved result to {filename}")
 
-async def process_companies(input_csv, output_csv):
+async def process_companies(input_csv, output_csv, concurrency=8, cache_file=CACHE_FILE):
     """Process all companies and find their career pages"""
     fieldnames = ['company', 'website', 'career_url', 'timestamp']
     
-    # Create the output file if it doesn't exist
-    if not os.path.exists(output_csv):
+    # Create the output file if it doesn't exist (or is empty, e.g. from an aborted run)
+    if not os.path.exists(output_csv) or os.path.getsize(output_csv) == 0:
         with open(output_csv, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
@@ -303,79 +555,125 @@ async def process_companies(input_csv, output_csv):
     # Read existing processed companies with non-null career URLs
     processed_companies = set()
     if os.path.exists(output_csv):
-        with open(output_csv, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Only consider companies with non-empty career_url as processed
-                if row.get('career_url'):
-                    processed_companies.add(row.get('company'))
+        try:
+            processed = pd.read_csv(output_csv, usecols=['company', 'career_url'], dtype=str, encoding='utf-8')
+            # Only consider companies with non-empty career_url as processed
+            processed_companies = set(processed.dropna(subset=['career_url'])['company'])
+        except pd.errors.EmptyDataError:
+            pass
     
     print(f"📋 Found {len(processed_companies)} already processed companies with career URLs")
     
     # Read input companies
-    companies = []
-    with open(input_csv, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        print(f"📋 Loading companies from {input_csv}")
-        for row in reader:
-            company_name = row.get('company', row.get('name', ''))
-            # Skip companies that already have career URLs
-            if company_name not in processed_companies:
-                companies.append(row)
+    print(f"📋 Loading companies from {input_csv}")
+    df = pd.read_csv(input_csv, dtype=str, encoding='utf-8-sig').fillna('')
+    if 'company' in df.columns:
+        company_names = df['company']
+    elif 'name' in df.columns:
+        company_names = df['name']
+    else:
+        company_names = pd.Series('', index=df.index)
+    # Skip companies that already have career URLs
+    companies = df[~company_names.isin(processed_companies)].to_dict('records')
     
     print(f"🔄 Processing {len(companies)} companies that need career URLs...")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={"width": 1280, "height": 800},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        )
-        
-        # Process each company
-        for index, company in enumerate(companies):
-            company_name = company.get('company', company.get('name', ''))
-            website = company.get('website', company.get('url', ''))
-            
-            if not website.startswith(('http://', 'https://')):
-                website = 'https://' + website
+    total = len(companies)
+    open_cache(cache_file)
+    
+    # A single writer task owns the output file; workers just enqueue rows
+    write_queue = asyncio.Queue()
+    writer_task = asyncio.create_task(csv_writer(output_csv, fieldnames, write_queue))
+    
+    # One pooled HTTP/2 client for all plain-HTTP probes
+    client = create_http_client()
+    
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(
+                viewport={"width": 1280, "height": 800},
+                user_agent=USER_AGENT
+            )
+            # Skip images, fonts, media, stylesheets and trackers for every page
+            await context.route("**/*", block_heavy_resources)
             
-            print(f"\n📊 Processing company {index+1}/{len(companies)}: {company_name}")
+            # Warm page pool; its size bounds how many companies run at once
+            pages = asyncio.Queue()
+            for _ in range(concurrency):
+                pages.put_nowait(await context.new_page())
             
-            page = await context.new_page()
-            try:
-                career_url = await find_career_page(page, website, company_name)
-                
-                # Create result and save immediately
-                result = {
-                    'company': company_name,
-                    'website': website,
-                    'career_url': career_url or '',
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
+            async def worker(index, company):
+                company_name = company.get('company', company.get('name', ''))
+                website = company.get('website', company.get('url', ''))
                 
-                # Append this result to the CSV
-                append_to_csv(output_csv, result, fieldnames)
+                if not website.startswith(('http://', 'https://')):
+                    website = 'https://' + website
                 
-                print(f"✅ Completed {company_name}: {'Found career URL' if career_url else 'No career URL found'}")
-                
-            except Exception as e:
-                print(f"❌ Error processing {company_name}: {e}")
-                result = {
-                    'company': company_name,
-                    'website': website,
-                    'career_url': '',
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                # Save failure immediately too
-                append_to_csv(output_csv, result, fieldnames)
-            finally:
-                await page.close()
-                # Add delay to avoid rate limiting
-                await asyncio.sleep(2)
+                # A None slot means the previous page was lost; make a fresh one
+                page = await pages.get()
+                print(f"\n📊 Processing company {index+1}/{total}: {company_name}")
+                try:
+                    if page is None:
+                        page = await context.new_page()
+                    career_url = await find_career_page(page, client, website, company_name)
+                    
+                    # Create result and save immediately
+                    result = {
+                        'company': company_name,
+                        'website': website,
+                        'career_url': career_url or '',
+                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    }
+                    
+                    # Hand this result to the CSV writer
+                    await write_queue.put(result)
+                    
+                    print(f"✅ Completed {company_name}: {'Found career URL' if career_url else 'No career URL found'}")
+                    
+                except Exception as e:
+                    print(f"❌ Error processing {company_name}: {e}")
+                    result = {
+                        'company': company_name,
+                        'website': website,
+                        'career_url': '',
+                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    }
+                    # Save failure immediately too
+                    await write_queue.put(result)
+                finally:
+                    # Reset the page before handing it to the next company; if that
+                    # fails, drop it and hand back an empty slot so the pool never shrinks
+                    if page is not None:
+                        try:
+                            await page.goto("about:blank")
+                        except Exception:
+                            try:
+                                await page.close()
+                            except Exception:
+                                pass
+                            page = None
+                    pages.put_nowait(page)
+            
+            # Process companies concurrently, bounded by the page pool
+            outcomes = await asyncio.gather(
+                *[worker(index, company) for index, company in enumerate(companies)],
+                return_exceptions=True
+            )
+            for company, outcome in zip(companies, outcomes):
+                if isinstance(outcome, BaseException):
+                    print(f"❌ Worker for {company.get('company', company.get('name', ''))} failed: {outcome!r}")
+            
+            await context.close()
+            await browser.close()
+    finally:
+        # Let the writer drain any remaining rows, and release shared resources
+        # even if the browser failed to start or the run was interrupted
+        await write_queue.put(None)
+        await writer_task
         
-        await context.close()
-        await browser.close()
+        await client.aclose()
+        close_cache()
     
     print(f"\n✅ All done! Results saved to {output_csv}")
 
@@ -383,6 +681,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Find career pages for companies')
     parser.add_argument('input_csv', type=str, help='CSV file with companies')
     parser.add_argument('output_csv', type=str, help='CSV file to save results')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of companies to process in parallel')
+    parser.add_argument('--cache', type=str, default=CACHE_FILE, help='Cache file for previously resolved domains')
     args = parser.parse_args()
     
-    asyncio.run(process_companies(args.input_csv, args.output_csv))
\ No newline at end of file
+    asyncio.run(process_companies(args.input_csv, args.output_csv, args.concurrency, args.cache))
\ No newline at end of file
@@ -1,6 +1,10 @@
 import asyncio
+import contextvars
+import glob
 import json
 import os
+import re
+import socket
 import subprocess
 import sys
 import time
@@ -13,35 +17,98 @@ try:
     import pandas as pd
 except ImportError:
     print("Installing pandas...")
-    subprocess.run("pip install pandas", shell=True, check=True)
+    subprocess.run(["pip", "install", "pandas"], check=True)
     import pandas as pd
 
+# Aho-Corasick keyword matching is optional; regex matching is the fallback
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Per-board runtimes (keyed by job board URL) from previous runs, used to
+# schedule long boards first
+RUNTIME_HISTORY_FILE = "job_board_runtimes.json"
+
+# Raw per-board scrape results, one timestamped file per run, appended as
+# each board finishes
+RESULTS_FILE_PATTERN = "job_board_results_*.jsonl"
+
+# CDP endpoint of the browser shared by all job boards in this run; set only
+# while a board's runner is active so our own launch is never redirected
+SHARED_BROWSER_CDP_URL = contextvars.ContextVar("shared_browser_cdp_url", default=None)
+
+# Job filtering criteria
+ROLE_KEYWORDS = ["product manager", "product owner", "product lead"]
+SENIORITY_KEYWORDS = ["senior", "group", "staff", "lead", "principal", "head"]
+LOCATION_KEYWORDS = ["bangalore", "bengaluru", "india", "remote"]
+
+# Keyword unions, compiled once for vectorized matching
+ROLE_RE = re.compile("|".join(map(re.escape, ROLE_KEYWORDS)), re.I)
+SENIORITY_RE = re.compile("|".join(map(re.escape, SENIORITY_KEYWORDS)), re.I)
+LOCATION_RE = re.compile("|".join(map(re.escape, LOCATION_KEYWORDS)), re.I)
+
+# Single automaton over every keyword, labelled with its criteria group
+def build_keyword_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for group, keywords in (
+        ("role", ROLE_KEYWORDS),
+        ("seniority", SENIORITY_KEYWORDS),
+        ("location", LOCATION_KEYWORDS),
+    ):
+        for keyword in keywords:
+            automaton.add_word(keyword, (group, keyword))
+    automaton.make_automaton()
+    return automaton
+
+KEYWORD_AUTOMATON = build_keyword_automaton()
+
+# Return the set of criteria groups whose keywords appear in lowercased text
+def keyword_groups(text):
+    return {group for _, (group, _) in KEYWORD_AUTOMATON.iter(text)}
+
+# Start of a candidate JSON object/array in model output
+JSON_START_RE = re.compile(r'[\[{]')
+
 # SIMPLIFIED FUNCTION TO HANDLE ALL SETUP
 def ensure_environment():
     # Setup proxy-lite if needed
     proxy_lite_dir = Path("proxy-lite")
+    ready_marker = proxy_lite_dir / ".ari-ready"
+    
+    # Warm start: setup already completed on a previous run
+    if ready_marker.exists():
+        sys.path.insert(0, str(proxy_lite_dir / "src"))
+        try:
+            from proxy_lite import Runner, RunnerConfig
+            return Runner, RunnerConfig
+        except ImportError:
+            # Stale marker: drop it and go through the normal setup checks
+            print("proxy-lite was marked ready but can't be imported, re-checking setup...")
+            ready_marker.unlink()
+    
     if not proxy_lite_dir.exists():
         print("Setting up proxy-lite...")
         
         # Clone proxy-lite repository
         print("Cloning proxy-lite repository...")
-        subprocess.run("git clone https://github.com/convergence-ai/proxy-lite.git", shell=True, check=True)
+        subprocess.run(["git", "clone", "https://github.com/convergence-ai/proxy-lite.git"], check=True)
         
         # Install uv first (as specified in the README)
         print("Installing uv package manager...")
-        subprocess.run("pip install uv", shell=True, check=True)
+        subprocess.run(["pip", "install", "uv"], check=True)
         
         # Setup according to README instructions
-        os.chdir("proxy-lite")
         print("Creating venv with uv...")
-        subprocess.run("uv venv --python 3.11 --python-preference managed", shell=True, check=True)
+        subprocess.run(["uv", "venv", "--python", "3.11", "--python-preference", "managed"], cwd=proxy_lite_dir, check=True)
         print("Running uv sync...")
-        subprocess.run("uv sync", shell=True, check=True)
+        subprocess.run(["uv", "sync"], cwd=proxy_lite_dir, check=True)
         print("Installing proxy-lite...")
-        subprocess.run("uv pip install -e .", shell=True, check=True)
+        subprocess.run(["uv", "pip", "install", "-e", "."], cwd=proxy_lite_dir, check=True)
         print("Installing playwright...")
-        subprocess.run("playwright install", shell=True, check=True)
-        os.chdir("..")
+        subprocess.run(["playwright", "install"], cwd=proxy_lite_dir, check=True)
     
     # Try to import proxy_lite module
     proxy_spec = importlib.util.find_spec("proxy_lite")
@@ -66,31 +133,89 @@ def ensure_environment():
     
     print("Using HuggingFace demo endpoint for the model (vLLM doesn't work well on Windows)")
     
+    # Skip the whole setup on subsequent runs
+    ready_marker.touch()
+    
     return Runner, RunnerConfig
 
 # Load job boards from CSV
 def load_job_boards(csv_file_path):
     df = pd.read_csv(csv_file_path)
-    job_boards = []
     
-    for _, row in df.iterrows():
-        company_name = row.iloc[0]
-        job_board_url = row.iloc[-1]
-        
-        if isinstance(job_board_url, str) and (
-            job_board_url.startswith('http://') or 
-            job_board_url.startswith('https://')
-        ):
-            job_boards.append({
-                'company': company_name,
-                'url': job_board_url
-            })
+    # First column is the company, last column the job board URL
+    companies = df.iloc[:, 0]
+    urls = df.iloc[:, -1]
+    # Missing URLs become 'nan' here, so they fail the prefix check too
+    mask = urls.astype(str).str.startswith(('http://', 'https://'))
+    
+    job_boards = [
+        {'company': company_name, 'url': job_board_url}
+        for company_name, job_board_url in zip(companies[mask], urls[mask])
+    ]
     
     print(f"Loaded {len(job_boards)} job boards from CSV")
     return job_boards
 
+# Load per-board scrape runtimes recorded by previous runs
+def load_runtime_history(history_file=RUNTIME_HISTORY_FILE):
+    if not os.path.exists(history_file):
+        return {}
+    try:
+        with open(history_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+# Save per-board scrape runtimes for the next run's schedule
+def save_runtime_history(runtimes, history_file=RUNTIME_HISTORY_FILE):
+    with open(history_file, 'w', encoding='utf-8') as f:
+        json.dump(runtimes, f, indent=2, ensure_ascii=False)
+
+# Order job boards longest-expected-runtime first
+def schedule_job_boards(job_boards, runtimes):
+    # Boards without history are assumed to take the average known runtime;
+    # URL length breaks ties as a rough proxy for how deep the board is
+    default_runtime = sum(runtimes.values()) / len(runtimes) if runtimes else 0
+    return sorted(
+        job_boards,
+        key=lambda job_board: (
+            runtimes.get(job_board['url'], default_runtime),
+            len(job_board['url'])
+        ),
+        reverse=True
+    )
+
+# Pick a free local port for the shared browser's remote debugging endpoint
+def find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# Make proxy-lite's browser session attach to the shared browser
+def install_shared_browser_hook():
+    # proxy-lite launches Chromium itself and exposes no option for an existing
+    # browser, so wrap Playwright's launch: inside a runner (where the context
+    # variable is set) it connects over CDP instead, and the session's own
+    # new_context() call then gives each board an isolated context
+    from playwright.async_api import BrowserType
+    
+    if getattr(BrowserType.launch, "shares_browser", False):
+        return
+    
+    launch = BrowserType.launch
+    
+    async def launch_or_connect(self, *args, **kwargs):
+        cdp_url = SHARED_BROWSER_CDP_URL.get()
+        if cdp_url is None:
+            return await launch(self, *args, **kwargs)
+        # Closing a CDP-connected browser only disconnects and drops its contexts
+        return await self.connect_over_cdp(cdp_url)
+    
+    launch_or_connect.shares_browser = True
+    BrowserType.launch = launch_or_connect
+
 # Main scraper function
-async def scrape_job_board(Runner, RunnerConfig, job_board, headless=False):
+async def scrape_job_board(Runner, RunnerConfig, job_board, headless=False, cdp_url=None):
     company = job_board['company']
     url = job_board['url']
     
@@ -152,11 +277,15 @@ async def scrape_job_board(Runner, RunnerConfig, job_board, headless=False):
         
         # Use asyncio.wait_for to enforce timeout
         try:
-            # Run the scraper with timeout
-            result = await asyncio.wait_for(
-                runner.run(scraping_instructions), 
-                timeout=per_site_timeout
-            )
+            # Run the scraper with timeout, attached to the shared browser if any
+            cdp_token = SHARED_BROWSER_CDP_URL.set(cdp_url)
+            try:
+                result = await asyncio.wait_for(
+                    runner.run(scraping_instructions), 
+                    timeout=per_site_timeout
+                )
+            finally:
+                SHARED_BROWSER_CDP_URL.reset(cdp_token)
             
             # Check if we need to move on due to no jobs
             if "NO_RELEVANT_JOBS_FOUND" in result.result:
@@ -179,7 +308,8 @@ async def scrape_job_board(Runner, RunnerConfig, job_board, headless=False):
             return {
                 'company': company,
                 'source_url': url,
-                'result': '[]'  # Empty JSON array
+                'result': '[]',  # Empty JSON array
+                'error': 'timeout'  # Retried by --resume
             }
             
     except Exception as e:
@@ -187,9 +317,55 @@ async def scrape_job_board(Runner, RunnerConfig, job_board, headless=False):
         return {
             'company': company,
             'source_url': url,
-            'result': '[]'  # Empty JSON array
+            'result': '[]',  # Empty JSON array
+            'error': str(e) or type(e).__name__  # Retried by --resume
         }
 
+# Yield each top-level JSON object/array found in free-form text
+def iter_json_values(text):
+    decoder = json.JSONDecoder()
+    index = 0
+    while True:
+        # Jump to the next candidate opening bracket
+        match = JSON_START_RE.search(text, index)
+        if not match:
+            return
+        start = match.start()
+        try:
+            value, end = decoder.raw_decode(text, start)
+        except ValueError:
+            index = start + 1
+            continue
+        yield value
+        # Resume after the decoded value so nested objects aren't yielded twice
+        index = end
+
+# Path for a fresh results file for this run
+def new_results_path():
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return RESULTS_FILE_PATTERN.replace("*", timestamp)
+
+# Most recent results file from an earlier run, if any
+def latest_results_path():
+    # Timestamps sort chronologically, so the last name is the newest run
+    paths = sorted(glob.glob(RESULTS_FILE_PATTERN))
+    return paths[-1] if paths else None
+
+# Lazily read saved scrape results back from a JSONL file
+def iter_results(results_file):
+    if not os.path.exists(results_file):
+        return
+    with open(results_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line
+                continue
+
 # Parse job results
 def parse_job_results(results):
     all_jobs = []
@@ -200,69 +376,74 @@ def parse_job_results(results):
         result_text = result['result']
         
         try:
-            # Look for JSON-like structure in the text
-            import re
-            json_pattern = r'(\{[\s\S]*\}|\[[\s\S]*\])'
-            json_matches = re.findall(json_pattern, result_text)
-            
-            for json_str in json_matches:
-                try:
-                    data = json.loads(json_str)
-                    
-                    # Check if it's a list of jobs
-                    if isinstance(data, list):
-                        for job in data:
+            # Decode every JSON value embedded in the text
+            for data in iter_json_values(result_text):
+                # Check if it's a list of jobs
+                if isinstance(data, list):
+                    for job in data:
+                        if isinstance(job, dict) and 'title' in job:
+                            job['company'] = job.get('company', company)
+                            job['source_url'] = source_url
+                            job['extracted_at'] = datetime.now().isoformat()
+                            all_jobs.append(job)
+                
+                # Check if it's a dict with jobs
+                elif isinstance(data, dict):
+                    if 'jobs' in data and isinstance(data['jobs'], list):
+                        for job in data['jobs']:
                             if isinstance(job, dict) and 'title' in job:
                                 job['company'] = job.get('company', company)
                                 job['source_url'] = source_url
                                 job['extracted_at'] = datetime.now().isoformat()
                                 all_jobs.append(job)
-                    
-                    # Check if it's a dict with jobs
-                    elif isinstance(data, dict):
-                        if 'jobs' in data and isinstance(data['jobs'], list):
-                            for job in data['jobs']:
-                                if isinstance(job, dict) and 'title' in job:
-                                    job['company'] = job.get('company', company)
-                                    job['source_url'] = source_url
-                                    job['extracted_at'] = datetime.now().isoformat()
-                                    all_jobs.append(job)
-                        # Or a single job
-                        elif 'title' in data:
-                            data['company'] = data.get('company', company)
-                            data['source_url'] = source_url
-                            data['extracted_at'] = datetime.now().isoformat()
-                            all_jobs.append(data)
-                except json.JSONDecodeError:
-                    continue
+                    # Or a single job
+                    elif 'title' in data:
+                        data['company'] = data.get('company', company)
+                        data['source_url'] = source_url
+                        data['extracted_at'] = datetime.now().isoformat()
+                        all_jobs.append(data)
         except Exception as e:
             print(f"Error parsing results from {company}: {e}")
     
     # Filter jobs to match criteria
-    role_keywords = ["product manager", "product owner", "product lead"]
-    seniority_keywords = ["senior", "group", "staff", "lead", "principal", "head"]
-    location_keywords = ["bangalore", "bengaluru", "india", "remote"]
-    
-    filtered_jobs = []
-    for job in all_jobs:
-        title = job.get('title', '').lower()
-        description = job.get('description', '').lower()
-        location = job.get('location', '').lower()
+    if not all_jobs:
+        print("Found 0 relevant jobs after filtering")
+        return []
+    
+    df = pd.DataFrame(all_jobs)
+    
+    def text_column(name):
+        if name not in df.columns:
+            return pd.Series('', index=df.index)
+        return df[name].fillna('').astype(str)
+    
+    title = text_column('title')
+    description = text_column('description')
+    location = text_column('location')
+    
+    if KEYWORD_AUTOMATON is not None:
+        # One linear pass per field finds every keyword group at once
+        title_groups = title.str.lower().map(keyword_groups)
+        place_groups = (location + "\x00" + description).str.lower().map(keyword_groups)
         
+        role_match = title_groups.map(lambda groups: "role" in groups)
+        seniority_match = title_groups.map(lambda groups: "seniority" in groups)
+        location_match = place_groups.map(lambda groups: "location" in groups)
+    else:
         # Check if role keywords match
-        role_match = any(keyword in title.lower() for keyword in role_keywords)
+        role_match = title.str.contains(ROLE_RE)
         
         # Check if seniority keywords match
-        seniority_match = any(keyword in title.lower() for keyword in seniority_keywords)
+        seniority_match = title.str.contains(SENIORITY_RE)
         
         # Check if location keywords match
-        location_match = any(
-            keyword in location.lower() or keyword in description.lower() 
-            for keyword in location_keywords
+        location_match = (
+            location.str.contains(LOCATION_RE) |
+            description.str.contains(LOCATION_RE)
         )
-        
-        if role_match and seniority_match and location_match:
-            filtered_jobs.append(job)
+    
+    mask = role_match & seniority_match & location_match
+    filtered_jobs = [job for job, keep in zip(all_jobs, mask) if keep]
     
     print(f"Found {len(filtered_jobs)} relevant jobs after filtering")
     return filtered_jobs
@@ -305,6 +486,9 @@ async def main():
     parser.add_argument('--csv', type=str, default='companies.csv', help='Path to companies CSV file')
     parser.add_argument('--format', type=str, choices=['json', 'csv'], default='json', help='Output format')
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
+    parser.add_argument('--concurrency', type=int, default=5, help='Number of job boards to scrape in parallel')
+    parser.add_argument('--results', type=str, default=None, help='JSONL file that raw scrape results are appended to (default: a new timestamped file)')
+    parser.add_argument('--resume', action='store_true', help='Continue the latest results file, skipping job boards already saved in it')
     args = parser.parse_args()
     
     # Setup everything in one step
@@ -316,19 +500,82 @@ async def main():
         print("No valid job boards found in CSV. Exiting.")
         return
     
-    # Process each job board
-    results = []
+    # Results are only ever appended to, so an earlier run's file is never lost
+    results_path = args.results
+    if args.resume and not results_path:
+        results_path = latest_results_path()
+    if not results_path:
+        results_path = new_results_path()
+    print(f"Saving raw results to {results_path}")
+    
+    # Pick up where an interrupted run left off
+    if args.resume:
+        # Boards that timed out or errored only left a placeholder, so retry them
+        done_urls = {
+            result['source_url'] for result in iter_results(results_path)
+            if not result.get('error')
+        }
+        job_boards = [job_board for job_board in job_boards if job_board['url'] not in done_urls]
+        print(f"Resuming: {len(done_urls)} job boards already scraped, {len(job_boards)} remaining")
+    
+    # Longest-processing-time-first: start the slowest boards first so the
+    # tail of the run isn't a single long scrape
+    runtimes = load_runtime_history()
+    job_boards = schedule_job_boards(job_boards, runtimes)
+    
+    total = len(job_boards)
+    queue = asyncio.Queue()
     for i, job_board in enumerate(job_boards):
-        print(f"Processing job board {i+1}/{len(job_boards)}")
-        result = await scrape_job_board(Runner, RunnerConfig, job_board, args.headless)
-        results.append(result)
-        # Show progress update
-        print(f"Completed {i+1}/{len(job_boards)} job boards")
-        # Add a short delay between job boards
-        await asyncio.sleep(5)
-    
-    # Parse and export results
-    jobs = parse_job_results(results)
+        queue.put_nowait((i, job_board))
+    
+    # Each result is written as soon as it completes, so a crash loses nothing
+    results_file = open(results_path, 'a', encoding='utf-8')
+    if results_file.tell() > 0:
+        # Terminate a truncated last line so appended records stay parseable
+        results_file.write("\n")
+    
+    # Launch one Chromium for the whole run; each board's runner attaches to it
+    from playwright.async_api import async_playwright
+    install_shared_browser_hook()
+    playwright = await async_playwright().start()
+    cdp_port = find_free_port()
+    browser = await playwright.chromium.launch(
+        headless=args.headless,
+        args=[f"--remote-debugging-port={cdp_port}"]
+    )
+    cdp_url = f"http://127.0.0.1:{cdp_port}"
+    print(f"Sharing one browser across job boards via {cdp_url}")
+    
+    async def worker():
+        while True:
+            try:
+                i, job_board = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            print(f"Processing job board {i+1}/{total}")
+            started = time.monotonic()
+            try:
+                result = await scrape_job_board(Runner, RunnerConfig, job_board, args.headless, cdp_url)
+                results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                results_file.flush()
+            except Exception as e:
+                print(f"Error processing job board {job_board['url']}: {e}")
+            # URLs are always strings, so keys survive the JSON round-trip unchanged
+            runtimes[job_board['url']] = round(time.monotonic() - started, 1)
+            # Show progress update
+            print(f"Completed {i+1}/{total} job boards")
+    
+    try:
+        await asyncio.gather(*[worker() for _ in range(min(args.concurrency, total))])
+    finally:
+        results_file.close()
+        # Keep the runtimes measured so far even if the run was interrupted
+        save_runtime_history(runtimes)
+        await browser.close()
+        await playwright.stop()
+    
+    # Parse and export results, streaming them back from disk
+    jobs = parse_job_results(iter_results(results_path))
     export_results(jobs, args.format)
 
 if __name__ == "__main__":